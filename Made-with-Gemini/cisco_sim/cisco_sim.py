@@ -1,930 +1,1122 @@
-#!/usr/bin/env python3
-
-import sys
-import time
-import re
-import inspect  # Added for better error checking
-
-# --- Attempt to use readline ---
-try:
-    import readline
-    READLINE_AVAILABLE = True
-except ImportError:
-    print("Readline library not found or failed to import. Tab completion disabled.")
-    READLINE_AVAILABLE = False
-
-# --- Constants for Modes ---
-USER_EXEC = 1
-PRIV_EXEC = 2
-GLOBAL_CONFIG = 3
-INTERFACE_CONFIG = 4
-
-# --- Custom Exceptions ---
-
-
-class AmbiguousCommandError(Exception):
-    pass
-
-
-class InvalidInputError(Exception):
-    pass
-
-# --- Tab Completion Logic (CiscoCompleter class - unchanged from previous version) ---
-
-
-class CiscoCompleter:
-    """Handles command completion based on simulator state."""
-
-    def __init__(self, simulator):
-        self.simulator = simulator
-        self.matches = []
-
-    def _get_available_commands(self):
-        """Get commands relevant to the current mode."""
-        # Use the simulator's new helper for consistency
-        return sorted(self.simulator._get_valid_commands_for_mode())
-
-    def _get_show_completions(self, line_parts):
-        """Completions for 'show ...'"""
-        # Allow abbreviation in completion suggestions too
-        show_options = ['version', 'running-config', 'run', 'ip', 'history']
-        if len(line_parts) == 2:  # Completing 'show <word>'
-            current_text = line_parts[1]
-            return [s + ' ' for s in show_options if s.startswith(current_text)]
-        # Completing 'show ip <word>'
-        elif len(line_parts) == 3 and line_parts[1].startswith('ip'):
-            current_text = line_parts[2]
-            ip_options = ['interface']
-            return [s + ' ' for s in ip_options if s.startswith(current_text)]
-        # Completing 'show ip interface <word>'
-        elif len(line_parts) == 4 and line_parts[1].startswith('ip') and line_parts[2].startswith('int'):
-            current_text = line_parts[3]
-            ip_int_options = ['brief']
-            return [s + ' ' for s in ip_int_options if s.startswith(current_text)]
-        return []
-
-    def _get_interface_completions(self, line_parts):
-        """Completions for 'interface ...' or arguments"""
-        # Suggest interface types or existing names
-        if len(line_parts) == 2:
-            current_text = line_parts[1]
-            types = ['GigabitEthernet', 'FastEthernet']
-            existing = list(self.simulator.running_config['interfaces'].keys())
-            possible = types + existing
-            # Add / hint for types
-            # Suggest abbreviations too
-            abbreviations = ['g', 'gi', 'f', 'fa']
-            possible.extend(abbreviations)
-            possible = sorted(list(set(possible)))  # Unique and sorted
-
-            completions = []
-            for s in possible:
-                if s.startswith(current_text):
-                    # Add space for full types, / for abbreviations needing numbers
-                    suffix = ' '
-                    if s.lower() in ['g', 'gi', 'f', 'fa']:
-                        suffix = '/'  # Hint that number is needed
-                    elif s in types:
-                        suffix = ' '  # Full type name
-                    elif s in existing:
-                        suffix = ' '  # Existing interface name
-
-                    # Avoid suggesting 'g' if user typed 'gi' already
-                    is_more_specific_match = any(p.startswith(s) and len(p) > len(
-                        s) for p in possible if p.startswith(current_text))
-                    if not (s in abbreviations and is_more_specific_match and len(s) < len(current_text)):
-                        completions.append(s + suffix)
-
-            return list(set(completions))  # Unique suggestions
-
-        elif len(line_parts) > 2:  # Potentially completing number part
-            intf_type_part = line_parts[1]
-            current_text = line_parts[-1]  # Text being completed
-
-            # Check if previous part looks like a type abbreviation or start
-            if intf_type_part.lower().startswith(('g', 'f')):
-                # Suggest common numbers or complete existing full names
-                # Reconstruct potential base name
-                base_name = "".join(line_parts[1:-1])
-                existing = list(
-                    self.simulator.running_config['interfaces'].keys())
-                completions = []
-
-                # Suggest simple numbers if '/' was just typed or part of current text
-                if line_parts[-2].endswith('/') or '/' in current_text:
-                    # Extract number part being typed
-                    num_part_match = re.search(
-                        r"(\d+(?:/\d*)?)$", current_text)
-                    num_part_typed = num_part_match.group(
-                        1) if num_part_match else ""
-
-                    for i in range(5):  # Suggest 0/0 to 0/4
-                        num = f"0/{i}"
-                        if num.startswith(num_part_typed):
-                            # Append the part of num not typed yet
-                            completions.append(num[len(num_part_typed):] + ' ')
-
-                # Suggest completions for existing interfaces if matching type/start
-                # Reconstruct potential full name start based on input
-                potential_start = intf_type_part  # Start with the first part
-                if len(line_parts) > 2:
-                    # Add middle parts if any
-                    potential_start += "".join(line_parts[2:-1])
-                potential_start += current_text  # Add the part being completed
-
-                for name in existing:
-                    # Check if existing name starts with the reconstructed potential name
-                    if name.lower().startswith(potential_start.lower()):
-                        # Offer the rest of the name as completion
-                        completion_text = name[len(potential_start):] + ' '
-                        if completion_text:  # Avoid empty completions
-                            completions.append(completion_text)
-
-                return list(set(completions))  # Unique suggestions
-        return []
-
-    def _get_ip_completions(self, line_parts):
-        """Completions for 'ip ...'"""
-        if len(line_parts) == 2:
-            current_text = line_parts[1]
-            options = ['address']
-            return [s + ' ' for s in options if s.startswith(current_text)]
-        # Could add hints for IP/subnet format later if needed
-        return []
-
-    def _get_no_completions(self, line_parts):
-        """Completions for 'no ...'"""
-        if self.simulator.mode == INTERFACE_CONFIG:
-            options = ['shutdown', 'ip']
-            if len(line_parts) == 2:
-                current_text = line_parts[1]
-                return [s + ' ' for s in options if s.startswith(current_text)]
-            elif len(line_parts) == 3 and line_parts[1].startswith('ip'):
-                current_text = line_parts[2]
-                ip_options = ['address']
-                return [s + ' ' for s in ip_options if s.startswith(current_text)]
-        elif self.simulator.mode == GLOBAL_CONFIG:
-            options = ['hostname']  # Example if 'no hostname' was valid
-            if len(line_parts) == 2:
-                current_text = line_parts[1]
-                return [s + ' ' for s in options if s.startswith(current_text)]
-
-        return []
-
-    def complete(self, text, state):
-        """This is the completer function called by readline."""
-        line = readline.get_line_buffer()
-        # Use regex to split, handling multiple spaces better
-        line_parts = re.split(r'\s+', line.strip())
-        if line.endswith(' '):
-            line_parts.append('')  # Add empty string if ending with space
-
-        # If the line is empty or the cursor is at the beginning of a word
-        if not line_parts or line_parts[-1] == '':
-            current_text = ""
-            completing_new_word = True
-        else:
-            current_text = line_parts[-1]
-            completing_new_word = False
-
-        if state == 0:
-            # This is the first time for this completion, compute matches
-            self.matches = []
-            available_cmds = self._get_available_commands()
-
-            # --- Context-Specific Completion ---
-            if len(line_parts) <= 1:
-                # Completing the very first command word
-                self.matches = [
-                    cmd + ' ' for cmd in available_cmds if cmd.startswith(current_text)]
-
-            # Check first word abbreviation for context
-            elif len(line_parts) > 1:
-                first_cmd_input = line_parts[0]
-                possible_first_cmds = [
-                    cmd for cmd in available_cmds if cmd.startswith(first_cmd_input)]
-                matched_first_cmd = possible_first_cmds[0] if len(
-                    possible_first_cmds) == 1 else None
-
-                if matched_first_cmd == 'show' and self.simulator.mode == PRIV_EXEC:
-                    self.matches = self._get_show_completions(line_parts)
-
-                elif matched_first_cmd == 'configure' and self.simulator.mode == PRIV_EXEC:
-                    # Complete 'terminal' after 'configure' or abbreviation
-                    if len(line_parts) == 2:
-                        options = ['terminal']
-                        self.matches = [
-                            opt + ' ' for opt in options if opt.startswith(current_text)]
-
-                elif matched_first_cmd == 'interface' and self.simulator.mode == GLOBAL_CONFIG:
-                    self.matches = self._get_interface_completions(line_parts)
-
-                elif matched_first_cmd == 'hostname' and self.simulator.mode == GLOBAL_CONFIG:
-                    pass  # No standard completions for hostname value
-
-                elif matched_first_cmd == 'ip' and self.simulator.mode == INTERFACE_CONFIG:
-                    self.matches = self._get_ip_completions(line_parts)
-
-                elif matched_first_cmd == 'no':
-                    self.matches = self._get_no_completions(line_parts)
-
-                # Add more context specific completions here
-
-            # --- Generic Completion (Fallback) ---
-            # If no specific context matched and completing a new word, offer base commands
-            if not self.matches and completing_new_word:
-                self.matches = [
-                    cmd + ' ' for cmd in available_cmds if cmd.startswith(current_text)]
-
-        # Return the match for the current state
-        try:
-            return self.matches[state]
-        except IndexError:
-            return None
-
-
-class CiscoDeviceSimulator:
-    """Simulates a basic Cisco IOS CLI."""
-
-    def __init__(self, hostname="Router"):
-        self.hostname = hostname
-        self.mode = USER_EXEC
-        self.running_config = {
-            'hostname': hostname,
-            'interfaces': {}  # Format: {'GigabitEthernet0/0': {'ip_address': ..., 'subnet_mask': ..., 'status': ..., 'admin_status': ...}}
-        }
-        self.current_interface = None
-        self.command_history = []
-
-        # Command Definitions (Handlers for base commands)
-        # Note: Multi-word commands like 'show run' are handled in process_command/do_show
-        self.commands = {
-            USER_EXEC: {
-                'enable': self.do_enable,
-                'exit': self.do_exit_quit,
-                'quit': self.do_exit_quit,
-                '?': self.do_help,
-            },
-            PRIV_EXEC: {
-                'disable': self.do_disable,
-                'exit': self.do_exit_quit,
-                'end': self.do_end,  # Technically 'end' is more for config modes
-                'configure': self.do_configure,
-                'show': self.do_show,
-                '?': self.do_help,
-                'history': self.show_history,  # Add history directly here
-            },
-            GLOBAL_CONFIG: {
-                'exit': self.do_exit_mode,
-                'end': self.do_end,
-                'hostname': self.do_hostname,
-                'interface': self.do_interface,
-                'no': self.do_no,
-                '?': self.do_help,
-            },
-            INTERFACE_CONFIG: {
-                'exit': self.do_exit_mode,
-                'end': self.do_end,
-                'ip': self.do_ip,
-                'shutdown': self.do_shutdown,
-                'no': self.do_no,
-                '?': self.do_help,
-            }
-        }
-
-        # --- Setup Readline Completion (if available) ---
-        if READLINE_AVAILABLE:
-            self.completer = CiscoCompleter(self)
-            readline.set_completer(self.completer.complete)
-            readline.set_completer_delims(' \t\n;')
-            readline.parse_and_bind('tab: complete')
-
-    def get_prompt(self):
-        # (Unchanged)
-        host = self.running_config['hostname']
-        if self.mode == USER_EXEC:
-            return f"{host}>"
-        if self.mode == PRIV_EXEC:
-            return f"{host}#"
-        if self.mode == GLOBAL_CONFIG:
-            return f"{host}(config)#"
-        if self.mode == INTERFACE_CONFIG:
-            return f"{host}(config-if)#"
-        return f"{host}?>"
-
-    def run(self):
-        # (Unchanged)
-        print("--- Basic Cisco CLI Simulator (Tab Completion & Abbreviation Enabled) ---")
-        print("Type '?' for help, 'exit' or 'quit' to leave.")
-        while True:
-            try:
-                prompt = self.get_prompt()
-                line = input(prompt).strip()
-                if line:
-                    # Add non-empty, non-history commands to readline history
-                    if READLINE_AVAILABLE and line.lower() != 'history' and (not self.command_history or line != self.command_history[-1]):
-                        readline.add_history(line)
-                    # Keep our internal history too
-                    self.command_history.append(line)
-                    self.process_command(line)
-            except (EOFError, KeyboardInterrupt):
-                print("\nExiting simulator.")
-                break
-            except AmbiguousCommandError as ace:
-                print(f"% Ambiguous command: \"{ace}\"")
-            except InvalidInputError as iie:
-                self.print_invalid_input(line, str(iie))
-            except Exception as e:
-                print(f"An unexpected error occurred: {e}")
-                import traceback
-                traceback.print_exc()  # More debug info
-
-    # --- NEW: Helper to get all valid commands for the current mode ---
-    def _get_valid_commands_for_mode(self):
-        """Returns a list of all valid command *starters* for the current mode."""
-        commands = list(self.commands.get(self.mode, {}).keys())
-        # Add commands handled specially or in sub-modes if applicable
-        # Note: These are the *first words* of commands
-        if self.mode == PRIV_EXEC:
-            # 'show' and 'configure' are already in self.commands[PRIV_EXEC]
-            pass
-        if self.mode == GLOBAL_CONFIG:
-            # 'hostname', 'interface', 'no' are already in self.commands[GLOBAL_CONFIG]
-            pass
-        if self.mode == INTERFACE_CONFIG:
-            # 'ip', 'shutdown', 'no' are already in self.commands[INTERFACE_CONFIG]
-            pass
-
-        # Add base commands if applicable (like exit, end, ?)
-        # These should already be in the dictionaries, but ensure consistency
-        if '?' not in commands:
-            commands.append('?')
-        if self.mode != USER_EXEC and 'exit' not in commands:
-            commands.append('exit')
-        if self.mode in [GLOBAL_CONFIG, INTERFACE_CONFIG] and 'end' not in commands:
-            commands.append('end')
-
-        return sorted(list(set(commands)))  # Deduplicate and sort
-
-    # --- NEW: Helper to find command by abbreviation ---
-    def _find_command_by_abbreviation(self, user_input, available_commands):
-        """
-        Finds a unique command from available_commands that starts with user_input.
-        Returns the full command name if unique.
-        Raises AmbiguousCommandError if multiple matches.
-        Raises InvalidInputError if no match.
-        """
-        user_input_lower = user_input.lower()
-        matches = [cmd for cmd in available_commands if cmd.lower(
-        ).startswith(user_input_lower)]
-
-        if len(matches) == 1:
-            return matches[0]
-        elif len(matches) > 1:
-            # Check for exact match among ambiguous options
-            exact_match = [cmd for cmd in matches if cmd.lower()
-                           == user_input_lower]
-            if len(exact_match) == 1:
-                return exact_match[0]
-            raise AmbiguousCommandError(user_input)
-        else:
-            raise InvalidInputError(user_input)  # No command starts with this
-
-    def process_command(self, line):
-        """Parses and executes a command line using abbreviation."""
-        parts = line.split()
-        if not parts:
-            return
-
-        user_cmd_input = parts[0]
-        args = parts[1:]
-
-        # --- Find command handler using abbreviation ---
-        available_commands = self._get_valid_commands_for_mode()
-        try:
-            full_command = self._find_command_by_abbreviation(
-                user_cmd_input, available_commands)
-        except (AmbiguousCommandError, InvalidInputError) as e:
-            # Reraise specific errors to be caught in run() loop
-            raise e
-
-        # --- Get the handler ---
-        handler = self.commands.get(self.mode, {}).get(full_command)
-
-        # --- Execute ---
-        if handler:
-            try:
-                # Pass the *original* arguments list to the handler
-                handler(args)
-            except TypeError as te:
-                # Check arity mismatch more carefully
-                sig = inspect.signature(handler)
-                num_required_params = len([p for p in sig.parameters.values(
-                    # Count non-default params excluding self
-                ) if p.default is p.empty and p.name != 'self'])
-                if len(args) < num_required_params:
-                    print(f"% Incomplete command.")
-                else:
-                    # Could be too many args if handler takes none, or other type error
-                    # Let specific handlers raise ValueError for bad args
-                    print(
-                        f"% Invalid input or arguments for command '{full_command}'.")
-                    # print(f"Debug TypeError: {te}") # Uncomment for debug
-            except ValueError as ve:  # Handlers should raise ValueError for bad args
-                print(f"% {ve}")  # Print specific error from handler
-            except IndexError:
-                # Should be less common now, but catch just in case
-                print("% Incomplete command.")
-        else:
-            # This case should be less likely if _get_valid_commands covers all handlers
-            print(
-                f"% Command lookup failed for '{full_command}' (internal error).")
-
-    def print_invalid_input(self, line, command_part):
-        """Prints the standard Cisco 'Invalid input' error."""
-        # Try to find the specific part that caused the error
-        marker_pos = -1
-        # Use regex to find the first occurrence, case-insensitive
-        try:
-            # Escape regex special characters in the command part
-            escaped_part = re.escape(command_part)
-            match = re.search(escaped_part, line, re.IGNORECASE)
-            if match:
-                marker_pos = match.start()
-        except re.error:
-            pass  # Ignore regex errors if command_part is weird
-
-        if marker_pos == -1:
-            # Fallback: find first non-space character
-            match = re.search(r'\S', line)
-            marker_pos = match.start() if match else 0
-
-        print("% Invalid input detected at '^' marker.")
-        print(f"  {line}")
-        print(f"  {' ' * marker_pos}^")
-
-    # --- Command Handlers (do_* methods - updated for arg abbreviation) ---
-
-    def do_help(self, args):
-        # (Implementation largely unchanged)
-        print("Available commands in this context:")
-        # Use the helper to get relevant commands
-        valid_commands = self._get_valid_commands_for_mode()
-        for cmd in valid_commands:
-            print(f"  {cmd}")
-        print("(Use TAB for completion, abbreviations are supported)")
-
-    def do_exit_quit(self, args):
-        # (Unchanged)
-        if self.mode == USER_EXEC or self.mode == PRIV_EXEC:
-            print("Exiting simulator.")
-            sys.exit(0)
-        else:
-            # Should not happen due to command availability check, but good practice
-            raise ValueError("Command not available in this mode.")
-
-    def do_exit_mode(self, args):
-        # (Unchanged)
-        if self.mode == GLOBAL_CONFIG:
-            self.mode = PRIV_EXEC
-        elif self.mode == INTERFACE_CONFIG:
-            self.mode = GLOBAL_CONFIG
-            self.current_interface = None  # Clear current interface when exiting if-mode
-
-    def do_end(self, args):
-        # (Unchanged)
-        if self.mode in [GLOBAL_CONFIG, INTERFACE_CONFIG]:
-            self.mode = PRIV_EXEC
-            self.current_interface = None
-        else:
-            raise ValueError("Command not valid in this mode.")
-
-    def do_enable(self, args):
-        # (Unchanged)
-        self.mode = PRIV_EXEC
-        # Real Cisco might ask for password here if configured
-        # print("% Password: ***** (simulated)") # Keep it simple
-
-    def do_disable(self, args):
-        # (Unchanged)
-        self.mode = USER_EXEC
-
-    def do_configure(self, args):
-        """Enters Global Configuration mode. Expects arg starting with 't'."""
-        # Check for abbreviation 't' for 'terminal'
-        if not args or not args[0].lower().startswith('t'):
-            # Raise ValueError for specific feedback
-            raise ValueError(
-                "Incomplete command. Expecting 'configure terminal'")
-        self.mode = GLOBAL_CONFIG
-        print("Enter configuration commands, one per line. End with CNTL/Z or 'end'.")
-
-    def do_hostname(self, args):
-        """Sets hostname. Expects [new_hostname] in args."""
-        if not args:
-            raise ValueError("Incomplete command. Expecting 'hostname <name>'")
-        new_hostname = args[0]
-        # Basic validation (unchanged)
-        if not re.match(r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?$", new_hostname):
-            raise ValueError("Invalid hostname.")
-        self.running_config['hostname'] = new_hostname
-
-    def _normalize_interface_name(self, type_part, num_part):
-        """Standardizes interface names like g -> GigabitEthernet."""
-        t = type_part.lower()
-        if t.startswith('g'):
-            base = 'GigabitEthernet'
-        elif t.startswith('f'):
-            base = 'FastEthernet'
-        elif t.startswith('e'):  # Less common but possible
-            base = 'Ethernet'
-        else:
-            return None  # Invalid type
-        # Basic validation for number part
-        if not re.match(r"^\d+/\d+$", num_part):
-            return None
-        return f"{base}{num_part}"
-
-    def do_interface(self, args):
-        """Enters interface config mode. Expects [type, number] in args (abbreviations ok)."""
-        if len(args) < 1:  # Need at least the type part
-            raise ValueError(
-                "Incomplete command. Expecting 'interface <type><number>' or 'interface <type> <number>'")
-
-        # Join args in case user typed "g 0/0" vs "g0/0"
-        intf_input = "".join(args)
-
-        # Use regex to separate type abbreviation/name from number
-        # Allows forms like: g0/0, gi0/0, GigabitEthernet0/0, f0/1, fa0/1
-        match = re.match(r"([a-zA-Z]+)\s*(\d+/\d+)", intf_input, re.IGNORECASE)
-        if not match:
-            raise ValueError(
-                f"Invalid interface format: {intf_input}. Expecting e.g., 'g0/0', 'FastEthernet0/1'")
-
-        intf_type_part = match.group(1)
-        intf_num_part = match.group(2)
-
-        intf_name = self._normalize_interface_name(
-            intf_type_part, intf_num_part)
-
-        if not intf_name:
-            raise ValueError(
-                f"Invalid interface type or number: {intf_type_part} {intf_num_part}")
-
-        # Create interface entry if it doesn't exist
-        if intf_name not in self.running_config['interfaces']:
-            self.running_config['interfaces'][intf_name] = {
-                'ip_address': None, 'subnet_mask': None,
-                'status': 'administratively down',  # Initial state
-                'admin_status': 'down'  # Explicit admin state
-            }
-        self.current_interface = intf_name
-        self.mode = INTERFACE_CONFIG
-
-    def do_ip(self, args):
-        """Handles IP commands. Expects arg starting with 'a', then ip, subnet."""
-        if not self.current_interface:
-            raise ValueError(
-                "Command must be run in interface configuration mode.")
-        # Check for 'address' abbreviation
-        if not args or not args[0].lower().startswith('a'):
-            raise ValueError(
-                "Incomplete command. Expecting 'ip address <ip> <subnet>'")
-        if len(args) != 3:
-            raise ValueError(
-                "Incorrect number of arguments. Expecting 'ip address <ip> <subnet>'")
-
-        ip_addr, subnet_mask = args[1], args[2]
-        if not self._is_valid_ip(ip_addr):
-            raise ValueError(f"Invalid IP address format: {ip_addr}")
-        if not self._is_valid_ip(subnet_mask):
-            raise ValueError(f"Invalid subnet mask format: {subnet_mask}")
-
-        intf_data = self.running_config['interfaces'][self.current_interface]
-        intf_data.update({'ip_address': ip_addr, 'subnet_mask': subnet_mask})
-        # Update status only if admin status is up
-        if intf_data['admin_status'] == 'up':
-            # Interface comes up when IP is assigned (if not admin down)
-            intf_data['status'] = 'up'
-
-    def _is_valid_ip(self, ip_str):
-        # (Unchanged)
-        parts = ip_str.split('.')
-        if len(parts) != 4:
-            return False
-        try:
-            return all(0 <= int(p) <= 255 for p in parts)
-        except ValueError:
-            return False
-
-    def do_shutdown(self, args):
-        """Administratively disables the current interface. Expects empty args."""
-        if not self.current_interface:
-            raise ValueError(
-                "Command must be run in interface configuration mode.")
-        if args:
-            raise ValueError("Command 'shutdown' takes no arguments.")
-
-        intf_data = self.running_config['interfaces'][self.current_interface]
-        intf_data['status'] = 'administratively down'
-        intf_data['admin_status'] = 'down'
-
-    def do_no(self, args):
-        """Handles 'no' commands. Expects [sub_command, ...] in args (abbreviations ok)."""
-        if not args:
-            raise ValueError("Incomplete 'no' command.")
-
-        # Find the sub-command using abbreviation relative to the current mode's 'no' options
-        no_sub_command_input = args[0]
-        sub_args = args[1:]
-
-        possible_no_commands = []
-        if self.mode == INTERFACE_CONFIG:
-            # What can follow 'no' in IF config
-            possible_no_commands = ['shutdown', 'ip']
-        elif self.mode == GLOBAL_CONFIG:
-            # What can follow 'no' in GLOBAL config
-            possible_no_commands = ['hostname', 'interface']
-
-        # Find the specific 'no' sub-command (e.g., 'shutdown' or 'ip')
-        matched_sub_command = None
-        ambiguous = False
-        matches = [cmd for cmd in possible_no_commands if cmd.startswith(
-            no_sub_command_input.lower())]
-
-        if len(matches) == 1:
-            matched_sub_command = matches[0]
-        elif len(matches) > 1:
-            # Check for exact match among ambiguous options
-            exact_match = [cmd for cmd in matches if cmd.lower()
-                           == no_sub_command_input.lower()]
-            if len(exact_match) == 1:
-                matched_sub_command = exact_match[0]
-            else:
-                ambiguous = True
-
-        if ambiguous:
-            raise AmbiguousCommandError(f"no {no_sub_command_input}")
-        if not matched_sub_command:
-            # Unrecognized 'no' variant
-            raise InvalidInputError(f"no {no_sub_command_input}")
-
-        # --- Execute the specific 'no' action ---
-        if self.mode == INTERFACE_CONFIG:
-            if matched_sub_command == 'shutdown':
-                self._no_shutdown(sub_args)
-            elif matched_sub_command == 'ip':
-                # Further check for 'address' abbreviation
-                if not sub_args or not sub_args[0].lower().startswith('a'):
-                    raise ValueError(
-                        "Incomplete command. Expecting 'no ip address'")
-                # Pass args after 'address' (should be none)
-                self._no_ip_address(sub_args[1:])
-            # Add other 'no' interface commands here if needed
-        elif self.mode == GLOBAL_CONFIG:
-            if matched_sub_command == 'hostname':
-                raise ValueError(
-                    "Cannot 'no hostname'. Set a new one instead.")
-            elif matched_sub_command == 'interface':
-                raise ValueError(
-                    "Use 'default interface <name>' to reset an interface (not implemented).")
-            # Add other 'no' global commands here if needed
-        else:
-            # Should not be reachable if mode checks work
-            raise ValueError("'no' command not applicable in this mode.")
-
-    def _no_shutdown(self, args):
-        """Handles 'no shutdown'."""
-        if not self.current_interface:
-            return  # Should be caught earlier
-        if args:
-            raise ValueError("'no shutdown' takes no arguments.")
-
-        intf_data = self.running_config['interfaces'][self.current_interface]
-        intf_data['admin_status'] = 'up'
-        # Interface only comes up if it has an IP or is configured for DHCP etc.
-        # Simple simulation: comes up if IP exists, otherwise stays down (protocol down)
-        intf_data['status'] = 'up' if intf_data.get('ip_address') else 'down'
-
-    def _no_ip_address(self, args):
-        """Handles 'no ip address'."""
-        if not self.current_interface:
-            return  # Should be caught earlier
-        if args:
-            raise ValueError("'no ip address' takes no further arguments.")
-
-        intf_data = self.running_config['interfaces'][self.current_interface]
-        intf_data.update({'ip_address': None, 'subnet_mask': None})
-        # If admin status is up, the operational status goes down without an IP
-        if intf_data['admin_status'] == 'up':
-            intf_data['status'] = 'down'
-
-    # --- Show Commands ---
-    def do_show(self, args):
-        """Handles 'show' commands. Expects [sub_command, ...] in args (abbreviations ok)."""
-        if not args:
-            raise ValueError(
-                "Incomplete command. Expecting 'show <subcommand>'")
-
-        sub_command_input = args[0]
-        sub_args = args[1:]
-
-        # Define possible 'show' subcommands
-        show_options = ['version', 'running-config', 'run', 'ip', 'history']
-
-        # Find subcommand by abbreviation
-        matches = [opt for opt in show_options if opt.startswith(
-            sub_command_input.lower())]
-        matched_sub_command = None
-        ambiguous = False
-
-        if len(matches) == 1:
-            matched_sub_command = matches[0]
-        elif len(matches) > 1:
-            # Special case: 'run' is abbreviation for 'running-config'
-            if sub_command_input.lower() == 'run' and 'running-config' in matches:
-                matched_sub_command = 'running-config'
-            # Check for exact match
-            elif sub_command_input.lower() in matches:
-                matched_sub_command = sub_command_input.lower()
-            else:
-                # Handle ambiguity between 'run'/'running-config' if user types 'r'
-                if sub_command_input.lower() == 'r' and 'run' in matches and 'running-config' in matches:
-                    ambiguous = True
-                # Add other ambiguity checks if needed
-                else:
-                    ambiguous = True
-
-        if ambiguous:
-            raise AmbiguousCommandError(f"show {sub_command_input}")
-        if not matched_sub_command:
-            # Unrecognized 'show' variant
-            raise InvalidInputError(f"show {sub_command_input}")
-
-        # --- Execute specific show command ---
-        if matched_sub_command == 'version':
-            self.show_version(sub_args)
-        elif matched_sub_command == 'running-config':  # Handles 'run' as well now
-            self.show_running_config(sub_args)
-        elif matched_sub_command == 'history':
-            # Pass args, though show_history ignores them
-            self.show_history(sub_args)
-        elif matched_sub_command == 'ip':
-            # Handle 'show ip ...' subcommands
-            if not sub_args:
-                raise ValueError(
-                    "Incomplete command. Expecting 'show ip <subcommand>'")
-            ip_sub_command_input = sub_args[0]
-            ip_sub_args = sub_args[1:]
-            # Define 'show ip' options
-            show_ip_options = ['interface']
-            ip_matches = [opt for opt in show_ip_options if opt.startswith(
-                ip_sub_command_input.lower())]
-
-            if len(ip_matches) == 1:
-                matched_ip_sub = ip_matches[0]
-                if matched_ip_sub == 'interface':
-                    # Handle 'show ip interface ...'
-                    if not ip_sub_args:
-                        raise ValueError(
-                            "Incomplete command. Expecting 'show ip interface <subcommand>' or 'brief'")
-                    ip_int_sub_input = ip_sub_args[0]
-                    # Define 'show ip interface' options
-                    # Add specific interfaces later?
-                    show_ip_int_options = ['brief']
-                    ip_int_matches = [opt for opt in show_ip_int_options if opt.startswith(
-                        ip_int_sub_input.lower())]
-
-                    if len(ip_int_matches) == 1:
-                        matched_ip_int_sub = ip_int_matches[0]
-                        if matched_ip_int_sub == 'brief':
-                            self.show_ip_interface_brief(
-                                ip_sub_args[1:])  # Pass args after 'brief'
-                        else:
-                            raise InvalidInputError(
-                                f"show ip interface {ip_int_sub_input}")
-                    elif len(ip_int_matches) > 1:
-                        raise AmbiguousCommandError(
-                            f"show ip interface {ip_int_sub_input}")
-                    else:
-                        raise InvalidInputError(
-                            f"show ip interface {ip_int_sub_input}")
-                else:
-                    # Other 'show ip' commands if added
-                    raise InvalidInputError(f"show ip {ip_sub_command_input}")
-            elif len(ip_matches) > 1:
-                raise AmbiguousCommandError(f"show ip {ip_sub_command_input}")
-            else:
-                raise InvalidInputError(f"show ip {ip_sub_command_input}")
-        else:
-            # Should not be reached
-            print(
-                f"% Internal error processing show command: {matched_sub_command}")
-
-    # --- show_version, show_running_config, _sort_interface_key, show_ip_interface_brief, show_history methods ---
-    # (Largely unchanged, but ensure they handle potential extra args gracefully if needed)
-
-    def show_version(self, args):
-        if args:
-            print(f"% Invalid input detected near '{args[0]}'")  # Basic check
-        print("Basic Cisco IOS Simulator (Python)\nVersion: 1.2 (Simulated w/ Abbreviation)\nHostname: {}\nUptime: {} (Simulated)".format(
-            self.running_config['hostname'], time.strftime('%Hh %Mm %Ss', time.gmtime(time.time()))))
-
-    def show_running_config(self, args):
-        if args:
-            print(f"% Invalid input detected near '{args[0]}'")
-        print("Building configuration...")
-        print("Current configuration:")  # More realistic start
-        print("!")
-        print(f"version 1.2 (Simulated)")
-        print("!")
-        print(f"hostname {self.running_config['hostname']}")
-        print("!")
-        # Ensure interfaces are sorted correctly
-        sorted_interfaces = sorted(
-            self.running_config['interfaces'].keys(), key=self._sort_interface_key)
-        for intf_name in sorted_interfaces:
-            intf_data = self.running_config['interfaces'][intf_name]
-            print(f"interface {intf_name}")
-            if intf_data.get('ip_address'):
-                print(
-                    f" ip address {intf_data['ip_address']} {intf_data['subnet_mask']}")
-            # Only show shutdown if it's administratively down
-            if intf_data.get('admin_status') == 'down':
-                print(" shutdown")
-            print("!")
-        print("!")
-        print("end")
-
-    def _sort_interface_key(self, intf_name):
-        # Match common interface types and numbers
-        match = re.match(r"([a-zA-Z]+)(\d+)/(\d+)", intf_name)
-        if match:
-            type_prefix = match.group(1).lower()
-            # Assign weights for sorting order (Ethernet < FastEth < GigEth < TenGig etc.)
-            type_weight = 99  # Default for unknown
-            if type_prefix.startswith('e'):
-                type_weight = 1
-            if type_prefix.startswith('f'):
-                type_weight = 2
-            if type_prefix.startswith('g'):
-                type_weight = 3
-            if type_prefix.startswith('t'):
-                type_weight = 4  # TenGigabitEthernet
-
-            slot = int(match.group(2))
-            port = int(match.group(3))
-            return (type_weight, slot, port)
-        # Fallback for non-matching names (shouldn't happen with normalization)
-        return (999, 0, 0)
-
-    def show_ip_interface_brief(self, args):
-        if args:
-            print(f"% Invalid input detected near '{args[0]}'")
-        print("Interface                  IP-Address      OK? Method Status                Protocol")
-        sorted_interfaces = sorted(
-            self.running_config['interfaces'].keys(), key=self._sort_interface_key)
-        if not sorted_interfaces:
-            print("% No interfaces configured for IP.")  # Message if empty
-            return
-        for intf_name in sorted_interfaces:
-            intf_data = self.running_config['interfaces'][intf_name]
-            ip_addr = intf_data.get('ip_address', 'unassigned')
-            # OK? is YES if IP is assigned AND interface is admin up
-            ok = "YES" if ip_addr != 'unassigned' and intf_data.get(
-                'admin_status') == 'up' else "NO"
-            method = "manual" if ip_addr != 'unassigned' else "unset"
-            # Status reflects admin status first
-            status = intf_data.get('status', 'down')
-            # Protocol is 'up' only if status is 'up' (simple simulation)
-            protocol = 'up' if status == 'up' else 'down'
-            print(
-                f"{intf_name:<26} {ip_addr:<15} {ok:<3} {method:<6} {status:<21} {protocol}")
-
-    def show_history(self, args=None):  # Accept args but ignore them
-        if args:
-            print(f"% Invalid input detected near '{args[0]}'")
-        # Use readline's history if available for more realistic behavior
-        if READLINE_AVAILABLE:
-            history_len = readline.get_current_history_length()
-            if history_len <= 0:
-                print("Command history is empty.")
-                return
-            print("Command History (from readline):")
-            # Readline history is 1-based index
-            for i in range(1, history_len + 1):
-                print(f" {i}: {readline.get_history_item(i)}")
-        else:
-            # Fallback to internal list
-            if not self.command_history:
-                print("Command history is empty.")
-                return
-            print("Command History (internal):")
-            for i, cmd in enumerate(self.command_history):
-                print(f" {i+1}: {cmd}")
-
-
-# --- Main Execution ---
-if __name__ == "__main__":
-    simulator = CiscoDeviceSimulator()
-    simulator.run()
+#!/usr/bin/env python3
+
+import sys
+import time
+import re
+import socket
+import bisect
+import functools
+import operator
+import traceback
+from collections import deque
+from dataclasses import dataclass
+
+# --- Attempt to use readline ---
+try:
+    import readline
+    READLINE_AVAILABLE = True
+except ImportError:
+    print("Readline library not found or failed to import. Tab completion disabled.")
+    READLINE_AVAILABLE = False
+
+# --- Constants for Modes ---
+USER_EXEC = 1
+PRIV_EXEC = 2
+GLOBAL_CONFIG = 3
+INTERFACE_CONFIG = 4
+
+# Whitespace split of the line buffer; runs on every Tab keystroke
+_WS_RE = re.compile(r'\s+')
+
+# 'interface' argument parsing: type word plus slot/port number
+_INTF_ARG_RE = re.compile(r"([a-zA-Z]+)\s*(\d+/\d+)", re.IGNORECASE)
+
+# Trailing slot/port digits being typed during interface completion
+_NUM_TAIL_RE = re.compile(r"(\d+(?:/\d*)?)$")
+
+# --- Interface name sorting ---
+# Compiled once; the key function runs per interface on every 'show' sort
+_INTF_SORT_RE = re.compile(r"([a-zA-Z]+)(\d+)/(\d+)")
+
+# Sort weight by first letter of the type (Ethernet < FastEth < GigEth <
+# TenGig); unknown types sort after all known ones
+_TYPE_WEIGHT = {'e': 1, 'f': 2, 'g': 3, 't': 4}
+
+# One row of 'show ip interface brief', parsed once; the per-row call is
+# then a plain bound-method invocation with no f-string re-parsing
+_BRIEF_FMT = "{:<26} {:<15} {:<3} {:<6} {:<21} {}".format
+
+# Pulls the three brief-row fields off an Interface record in one C-level
+# call instead of three attribute lookups per row
+_BRIEF_FIELDS = operator.attrgetter('ip_address', 'admin_status', 'status')
+
+# 'show running-config' fragments, likewise parsed once: the fixed
+# header (hostname is its only dynamic field) and one address line
+_RUN_HEADER_FMT = ("Building configuration...\n"
+                   "Current configuration:\n"
+                   "!\n"
+                   "version 1.2 (Simulated)\n"
+                   "!\n"
+                   "hostname {}\n"
+                   "!").format
+_RUN_IP_FMT = " ip address {} {}".format
+
+# 'show version' banner with only the per-call fields (hostname can be
+# reconfigured, uptime ticks) left as placeholders; parsed once, emitted
+# in a single write
+_VERSION_FMT = ("Basic Cisco IOS Simulator (Python)\n"
+                "Version: 1.2 (Simulated w/ Abbreviation)\n"
+                "Hostname: {}\n"
+                "Uptime: {:02d}h {:02d}m {:02d}s (Simulated)\n").format
+
+
+@functools.lru_cache(maxsize=512)
+def _interface_sort_key(intf_name):
+    """Sort key for interface names; memoized since names are stable."""
+    match = _INTF_SORT_RE.match(intf_name)
+    if match:
+        type_prefix = match.group(1).lower()
+        type_weight = _TYPE_WEIGHT.get(type_prefix[0], 99)
+        slot = int(match.group(2))
+        port = int(match.group(3))
+        return (type_weight, slot, port)
+    # Fallback for non-matching names (shouldn't happen with normalization)
+    return (999, 0, 0)
+
+
+def _resolve_abbrev(input_lower, options):
+    """Resolves a pre-lowered abbreviation against pre-lowered options.
+
+    Returns the unique (or exact) match, or None if nothing matches.
+    Raises AmbiguousCommandError for an ambiguous prefix.
+    """
+    # Two next() pulls decide the outcome without materializing a match
+    # list: the scan stops at the second hit, the earliest point at
+    # which uniqueness is settled
+    matches = (opt for opt in options if opt.startswith(input_lower))
+    first = next(matches, None)
+    if first is None:
+        return None
+    if next(matches, None) is None:
+        return first
+    # Several options share the prefix; an exact hit still wins
+    if input_lower in options:
+        return input_lower
+    raise AmbiguousCommandError(input_lower)
+
+
+# Marks a prefix shared by several options in a prefix-dispatch table
+_AMBIGUOUS = object()
+
+
+def _build_prefix_dispatch(handlers):
+    """Expand {option: handler} into {every_prefix: handler}.
+
+    Each proper prefix of an option maps to its handler, or to the
+    _AMBIGUOUS sentinel when several options share it. Full option names
+    are written last so an exact hit always resolves, even when it
+    prefixes a longer option ('run' vs 'running-config'). Resolution at
+    runtime is then a single dict probe per typed word.
+    """
+    table = {}
+    for option, handler in handlers.items():
+        for end in range(1, len(option)):
+            prefix = option[:end]
+            table[prefix] = _AMBIGUOUS if prefix in table else handler
+    table.update(handlers)
+    return table
+
+
+# --- Custom Exceptions ---
+
+
+class AmbiguousCommandError(Exception):
+    pass
+
+
+class InvalidInputError(Exception):
+    pass
+
+# --- Prefix Tree for fast completion lookups ---
+
+
+class Trie:
+    """Minimal prefix tree mapping a typed prefix to its matching words.
+
+    Built once per (static) word set; answering a completion query is a
+    descent to the prefix node plus enumeration of its subtree, i.e.
+    O(len(prefix) + k) instead of a linear startswith scan per keystroke.
+    """
+
+    __slots__ = ('_root',)
+
+    def __init__(self):
+        self._root = {}
+
+    @classmethod
+    def from_words(cls, words):
+        trie = cls()
+        for word in words:
+            trie.insert(word)
+        return trie
+
+    def insert(self, word):
+        node = self._root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[None] = word  # Terminal marker storing the complete word
+
+    def words_with_prefix(self, prefix):
+        """Return all inserted words starting with prefix, sorted."""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []  # No word has this prefix
+        words = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for key, child in current.items():
+                if key is None:
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return sorted(words)
+
+# --- Per-interface state ---
+
+
+@dataclass(slots=True)
+class Interface:
+    """State of one simulated interface.
+
+    A slotted record instead of a per-interface dict: attribute access is a
+    fixed-offset load rather than a string-key hash, and each record drops
+    the dict's hash-table overhead.
+    """
+    ip_address: str | None = None
+    subnet_mask: str | None = None
+    status: str = 'administratively down'  # Initial state
+    admin_status: str = 'down'  # Explicit admin state
+
+
+# Operational status by (admin_status, has_ip): a shut interface is
+# 'administratively down' whatever else holds, an enabled one is 'up'
+# only with an address configured
+_STATUS_TABLE = {
+    ('up', True): 'up',
+    ('up', False): 'down',
+    ('down', True): 'administratively down',
+    ('down', False): 'administratively down',
+}
+
+
+def _recompute_status(intf_data):
+    """Re-derive an interface's operational status after a state change.
+
+    One table lookup replaces the per-handler if/else fragments that each
+    encoded a slice of the same rule.
+    """
+    intf_data.status = _STATUS_TABLE[
+        (intf_data.admin_status, intf_data.ip_address is not None)]
+
+# --- Tab Completion Logic (CiscoCompleter class - unchanged from previous version) ---
+
+
+class CiscoCompleter:
+    """Handles command completion based on simulator state."""
+
+    # Fixed attribute layout: no per-instance __dict__, and attribute
+    # lookups in the per-keystroke complete() path hit fixed slot offsets
+    __slots__ = ('simulator', 'matches', '_match_cache_key', '_last_line',
+                 '_last_parts', '_show_trie', '_show_ip_trie',
+                 '_show_ip_int_trie', '_ip_trie', '_no_if_trie',
+                 '_no_global_trie', '_intf_static_suggestions')
+
+    # Option words frozen at class scope with their completion suffix baked
+    # in, so the per-keystroke filters neither rebuild lists nor concatenate
+    _SHOW_OPTIONS = ('version ', 'running-config ', 'run ', 'ip ', 'history ')
+    _CONFIGURE_OPTIONS = ('terminal ',)
+    _SHOW_IP_OPTIONS = ('interface ',)
+    _SHOW_IP_INT_OPTIONS = ('brief ',)
+    _IP_OPTIONS = ('address ',)
+    _NO_IF_OPTIONS = ('shutdown ', 'ip ')
+    _NO_GLOBAL_OPTIONS = ('hostname ',)  # Example if 'no hostname' was valid
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.matches = []
+        self._match_cache_key = None  # Buffer/context key of the cached matches
+        self._last_line = None  # Last tokenized buffer...
+        self._last_parts = []  # ...and its parts
+        # Per-context tries over the option tuples; a Tab press descends to
+        # the typed prefix instead of startswith-scanning each option
+        self._show_trie = Trie.from_words(self._SHOW_OPTIONS)
+        self._show_ip_trie = Trie.from_words(self._SHOW_IP_OPTIONS)
+        self._show_ip_int_trie = Trie.from_words(self._SHOW_IP_INT_OPTIONS)
+        self._ip_trie = Trie.from_words(self._IP_OPTIONS)
+        self._no_if_trie = Trie.from_words(self._NO_IF_OPTIONS)
+        self._no_global_trie = Trie.from_words(self._NO_GLOBAL_OPTIONS)
+        # Static 'interface' argument suggestions with the suffix baked in:
+        # full type names complete with a space, abbreviations hint the
+        # slot/port number with '/'
+        self._intf_static_suggestions = (
+            'FastEthernet ', 'GigabitEthernet ', 'f/', 'fa/', 'g/', 'gi/')
+
+    def _get_available_commands(self, prefix="", mode=None):
+        """Get commands relevant to the given (or current) mode that match prefix."""
+        if mode is None:
+            mode = self.simulator.mode
+        # Descend the per-mode trie instead of rebuilding/sorting a list
+        return self.simulator._mode_tries[mode].words_with_prefix(prefix)
+
+    def _get_show_completions(self, line_parts):
+        """Completions for 'show ...'"""
+        # Allow abbreviation in completion suggestions too
+        if len(line_parts) == 2:  # Completing 'show <word>'
+            current_text = line_parts[1]
+            return self._show_trie.words_with_prefix(current_text)
+        # Completing 'show ip <word>'
+        elif len(line_parts) == 3 and line_parts[1].startswith('ip'):
+            current_text = line_parts[2]
+            return self._show_ip_trie.words_with_prefix(current_text)
+        # Completing 'show ip interface <word>'
+        elif len(line_parts) == 4 and line_parts[1].startswith('ip') and line_parts[2].startswith('int'):
+            current_text = line_parts[3]
+            return self._show_ip_int_trie.words_with_prefix(current_text)
+        return []
+
+    def _get_interface_completions(self, line_parts, interfaces):
+        """Completions for 'interface ...' or arguments.
+
+        interfaces is the caller's snapshot of the configured-interface dict.
+        """
+        # Suggest interface types or existing names
+        if len(line_parts) == 2:
+            current_text = line_parts[1]
+            # Static suggestions (full types and abbreviation hints) carry
+            # their suffix already; existing names complete with a space.
+            # The old nested "more specific match" filter could never fire
+            # (a candidate passing the prefix test is never shorter than
+            # the typed text), so it is gone.
+            completions = [s for s in self._intf_static_suggestions
+                           if s.startswith(current_text)]
+            completions.extend(
+                name + ' ' for name in interfaces if name.startswith(current_text))
+            # dict.fromkeys dedupes in one pass while keeping insertion
+            # order, so readline's menu stays stable between Tab presses
+            return list(dict.fromkeys(completions))
+
+        elif len(line_parts) > 2:  # Potentially completing number part
+            intf_type_part = line_parts[1]
+            current_text = line_parts[-1]  # Text being completed
+
+            # Check if previous part looks like a type abbreviation or start
+            if intf_type_part.lower().startswith(('g', 'f')):
+                completions = []
+
+                # Suggest simple numbers if '/' was just typed or part of current text
+                if line_parts[-2].endswith('/') or '/' in current_text:
+                    # Extract number part being typed
+                    num_part_match = _NUM_TAIL_RE.search(current_text)
+                    num_part_typed = num_part_match.group(
+                        1) if num_part_match else ""
+
+                    for i in range(5):  # Suggest 0/0 to 0/4
+                        num = f"0/{i}"
+                        if num.startswith(num_part_typed):
+                            # Append the part of num not typed yet
+                            completions.append(num[len(num_part_typed):] + ' ')
+
+                # Suggest completions for existing interfaces if matching type/start
+                # Reconstruct potential full name start based on input
+                potential_start = intf_type_part  # Start with the first part
+                if len(line_parts) > 2:
+                    # Add middle parts if any
+                    potential_start += "".join(line_parts[2:-1])
+                potential_start += current_text  # Add the part being completed
+
+                # Lowercase the typed prefix once, then descend the interface
+                # trie; only names under the prefix node are visited
+                potential_lower = potential_start.lower()
+                interfaces_lower = self.simulator._interfaces_lower
+                for lower_name in self.simulator._interface_trie.words_with_prefix(potential_lower):
+                    name = interfaces_lower[lower_name]
+                    # Offer the rest of the name as completion
+                    completion_text = name[len(potential_start):] + ' '
+                    if completion_text:  # Avoid empty completions
+                        completions.append(completion_text)
+
+                return list(dict.fromkeys(completions))  # Ordered dedupe
+        return []
+
+    def _get_ip_completions(self, line_parts):
+        """Completions for 'ip ...'"""
+        if len(line_parts) == 2:
+            current_text = line_parts[1]
+            return self._ip_trie.words_with_prefix(current_text)
+        # Could add hints for IP/subnet format later if needed
+        return []
+
+    def _get_no_completions(self, line_parts, mode):
+        """Completions for 'no ...' in the caller's snapshot of the mode."""
+        if mode == INTERFACE_CONFIG:
+            if len(line_parts) == 2:
+                current_text = line_parts[1]
+                return self._no_if_trie.words_with_prefix(current_text)
+            elif len(line_parts) == 3 and line_parts[1].startswith('ip'):
+                current_text = line_parts[2]
+                return self._ip_trie.words_with_prefix(current_text)
+        elif mode == GLOBAL_CONFIG:
+            if len(line_parts) == 2:
+                current_text = line_parts[1]
+                return self._no_global_trie.words_with_prefix(current_text)
+
+        return []
+
+    def complete(self, text, state):
+        """This is the completer function called by readline."""
+        line = readline.get_line_buffer()
+        # Snapshot simulator state once into locals: keeps matches consistent
+        # if the mode changes mid-completion, and LOAD_FAST beats repeated
+        # attribute chains in the dispatch below
+        simulator = self.simulator
+        mode = simulator.mode
+        interfaces = simulator._interfaces
+        # Readline calls us with state=0,1,2,... for one completion and again
+        # on redisplay; memoize parse + matches on the buffer/context so an
+        # unchanged buffer answers every state from the cached list.
+        # len() rather than id(): the dict is mutated in place when
+        # interfaces are created, so identity alone would serve stale matches
+        cache_key = (line, readline.get_begidx(), readline.get_endidx(),
+                     mode, len(interfaces))
+        if cache_key == self._match_cache_key:
+            try:
+                return self.matches[state]
+            except IndexError:
+                return None
+
+        # Tokenize once per distinct buffer; a cache-key miss (e.g. after a
+        # mode change) still reuses the parse of an identical line
+        if line == self._last_line:
+            line_parts = self._last_parts
+        else:
+            # Use regex to split, handling multiple spaces better
+            line_parts = _WS_RE.split(line.strip())
+            if line.endswith(' '):
+                line_parts.append('')  # Add empty string if ending with space
+            self._last_line = line
+            self._last_parts = line_parts
+
+        # If the line is empty or the cursor is at the beginning of a word
+        if not line_parts or line_parts[-1] == '':
+            current_text = ""
+            completing_new_word = True
+        else:
+            current_text = line_parts[-1]
+            completing_new_word = False
+
+        if state == 0:
+            self._match_cache_key = cache_key
+
+            # This is the first time for this completion, compute matches
+            self.matches = []
+
+            # --- Context-Specific Completion ---
+            # Check first word abbreviation for context
+            if len(line_parts) > 1:
+                first_cmd_input = line_parts[0]
+                possible_first_cmds = self._get_available_commands(
+                    first_cmd_input, mode)
+                matched_first_cmd = possible_first_cmds[0] if len(
+                    possible_first_cmds) == 1 else None
+
+                if matched_first_cmd == 'show' and mode == PRIV_EXEC:
+                    self.matches = self._get_show_completions(line_parts)
+
+                elif matched_first_cmd == 'configure' and mode == PRIV_EXEC:
+                    # Complete 'terminal' after 'configure' or abbreviation
+                    if len(line_parts) == 2:
+                        self.matches = [
+                            opt for opt in self._CONFIGURE_OPTIONS
+                            if opt.startswith(current_text)]
+
+                elif matched_first_cmd == 'interface' and mode == GLOBAL_CONFIG:
+                    self.matches = self._get_interface_completions(
+                        line_parts, interfaces)
+
+                elif matched_first_cmd == 'hostname' and mode == GLOBAL_CONFIG:
+                    pass  # No standard completions for hostname value
+
+                elif matched_first_cmd == 'ip' and mode == INTERFACE_CONFIG:
+                    self.matches = self._get_ip_completions(line_parts)
+
+                elif matched_first_cmd == 'no':
+                    self.matches = self._get_no_completions(line_parts, mode)
+
+                # Add more context specific completions here
+
+            # --- Generic Completion ---
+            # First command word, or fallback when no context matched while
+            # completing a new word; one trie query serves both cases
+            if not self.matches and (len(line_parts) <= 1 or completing_new_word):
+                self.matches = [
+                    cmd + ' ' for cmd in self._get_available_commands(current_text, mode)]
+
+        # Return the match for the current state
+        try:
+            return self.matches[state]
+        except IndexError:
+            return None
+
+
+class CiscoDeviceSimulator:
+    """Simulates a basic Cisco IOS CLI."""
+
+    __slots__ = ('hostname', 'mode', '_running', '_start_time',
+                 'running_config', '_interfaces',
+                 'current_interface', 'command_history',
+                 '_sorted_intf_keys',
+                 '_interfaces_lower', '_interface_trie', 'commands',
+                 '_handler_min_args', '_dispatch', '_mode_tries',
+                 '_mode_commands_sorted', '_no_handlers', '_show_dispatch',
+                 '_show_ip_dispatch', '_show_ip_int_dispatch', 'completer')
+
+    # Compiled once; validates hostnames on every 'hostname' command
+    _HOSTNAME_RE = re.compile(
+        r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?$")
+
+    def __init__(self, hostname="Router"):
+        self.hostname = hostname
+        self.mode = USER_EXEC
+        self._running = True  # Cleared by do_exit_quit to end run()
+        # Monotonic start mark; show_version derives uptime from this
+        self._start_time = time.monotonic()
+        self.running_config = {
+            'hostname': hostname,
+            'interfaces': {}  # Format: {'GigabitEthernet0/0': Interface(...)}
+        }
+        # Direct alias to the (mutated in place, never replaced) interfaces
+        # dict: one slot load instead of the attribute + key chain
+        self._interfaces = self.running_config['interfaces']
+        self.current_interface = None
+        # Bounded like a real device's history buffer; appends past the
+        # limit silently drop the oldest entry
+        self.command_history = deque(maxlen=1000)
+        # Interface names kept in display order; do_interface insorts new
+        # names so the show commands never re-sort (interfaces are never
+        # removed in this simulator)
+        self._sorted_intf_keys = []
+        # Lowercased name -> canonical name, maintained by do_interface so
+        # case-insensitive completion doesn't re-lower every name per keystroke
+        self._interfaces_lower = {}
+        # Trie over the lowercased names; completion enumerates a subtree
+        # instead of scanning every configured interface
+        self._interface_trie = Trie()
+
+        # Command Definitions (Handlers for base commands)
+        # Note: Multi-word commands like 'show run' are handled in process_command/do_show
+        self.commands = {
+            USER_EXEC: {
+                'enable': self.do_enable,
+                'exit': self.do_exit_quit,
+                'quit': self.do_exit_quit,
+                '?': self.do_help,
+            },
+            PRIV_EXEC: {
+                'disable': self.do_disable,
+                'exit': self.do_exit_quit,
+                'end': self.do_end,  # Technically 'end' is more for config modes
+                'configure': self.do_configure,
+                'show': self.do_show,
+                '?': self.do_help,
+                'history': self.show_history,  # Add history directly here
+            },
+            GLOBAL_CONFIG: {
+                'exit': self.do_exit_mode,
+                'end': self.do_end,
+                'hostname': self.do_hostname,
+                'interface': self.do_interface,
+                'no': self.do_no,
+                '?': self.do_help,
+            },
+            INTERFACE_CONFIG: {
+                'exit': self.do_exit_mode,
+                'end': self.do_end,
+                'ip': self.do_ip,
+                'shutdown': self.do_shutdown,
+                'no': self.do_no,
+                '?': self.do_help,
+            }
+        }
+
+        # Required-argument count per handler, read straight off the code
+        # object (minus self and defaulted params) instead of building
+        # inspect.Signature objects
+        self._handler_min_args = {
+            handler: (handler.__func__.__code__.co_argcount - 1
+                      - len(handler.__defaults__ or ()))
+            for mode_commands in self.commands.values()
+            for handler in mode_commands.values()
+        }
+
+        # Flattened (mode, command) -> handler table; dispatching a resolved
+        # command is one dict probe instead of two chained .get() calls
+        self._dispatch = {
+            (mode, name): handler
+            for mode, mode_commands in self.commands.items()
+            for name, handler in mode_commands.items()
+        }
+
+        # Per-mode completion tries, built once (the command sets are static).
+        # Tab completion descends these instead of rebuilding/sorting lists.
+        self._mode_tries = {mode: Trie.from_words(cmds)
+                            for mode, cmds in self.commands.items()}
+        # Prefix-dispatch tables for the 'show' levels: every abbreviation
+        # is expanded to its bound handler once here, so resolving a typed
+        # word at runtime is a single dict probe (no trie descent per call)
+        self._show_dispatch = _build_prefix_dispatch({
+            'version': self.show_version,
+            'running-config': self.show_running_config,
+            'run': self.show_running_config,  # Alias; same handler
+            'ip': self._do_show_ip,
+            'history': self.show_history,
+        })
+        self._show_ip_dispatch = _build_prefix_dispatch({
+            'interface': self._do_show_ip_interface,
+        })
+        self._show_ip_int_dispatch = _build_prefix_dispatch({
+            'brief': self.show_ip_interface_brief,
+        })
+        # Resolved 'no' sub-command -> bound handler, keyed by mode like
+        # the main dispatch table; do_no executes with one probe instead
+        # of nested mode/name if-chains
+        self._no_handlers = {
+            (INTERFACE_CONFIG, 'shutdown'): self._no_shutdown,
+            (INTERFACE_CONFIG, 'ip'): self._no_ip,
+            (GLOBAL_CONFIG, 'hostname'): self._no_hostname,
+            (GLOBAL_CONFIG, 'interface'): self._no_interface,
+        }
+        # Sorted command tuples per mode, frozen once for the same reason
+        self._mode_commands_sorted = {mode: tuple(sorted(cmds))
+                                      for mode, cmds in self.commands.items()}
+
+        # --- Setup Readline Completion (if available) ---
+        if READLINE_AVAILABLE:
+            self.completer = CiscoCompleter(self)
+            readline.set_completer(self.completer.complete)
+            readline.set_completer_delims(' \t\n;')
+            readline.parse_and_bind('tab: complete')
+
+    # Prompt suffix per mode; one lookup instead of a compare chain
+    _PROMPT_SUFFIX = {
+        USER_EXEC: '>',
+        PRIV_EXEC: '#',
+        GLOBAL_CONFIG: '(config)#',
+        INTERFACE_CONFIG: '(config-if)#',
+    }
+
+    def get_prompt(self):
+        host = self.running_config['hostname']
+        return f"{host}{self._PROMPT_SUFFIX.get(self.mode, '?>')}"
+
+    def run(self):
+        # (Unchanged)
+        print("--- Basic Cisco CLI Simulator (Tab Completion & Abbreviation Enabled) ---")
+        print("Type '?' for help, 'exit' or 'quit' to leave.")
+        while self._running:
+            try:
+                prompt = self.get_prompt()
+                line = input(prompt).strip()
+                if line:
+                    # Add non-empty, non-history commands to readline history.
+                    # The O(1) duplicate check against the deque's tail runs
+                    # before the lower() allocation.
+                    if (READLINE_AVAILABLE
+                            and (not self.command_history or line != self.command_history[-1])
+                            and line.lower() != 'history'):
+                        readline.add_history(line)
+                    # Keep our internal history too
+                    self.command_history.append(line)
+                    self.process_command(line)
+            except (EOFError, KeyboardInterrupt):
+                print("\nExiting simulator.")
+                break
+            except AmbiguousCommandError as ace:
+                print(f"% Ambiguous command: \"{ace}\"")
+            except InvalidInputError as iie:
+                self.print_invalid_input(line, str(iie))
+            except Exception as e:
+                print(f"An unexpected error occurred: {e}")
+                traceback.print_exc()  # More debug info
+
+    # --- NEW: Helper to get all valid commands for the current mode ---
+    def _get_valid_commands_for_mode(self):
+        """Returns the valid command *starters* for the current mode."""
+        # self.commands is the single source of truth per mode: every first
+        # word (including 'exit', 'end' and '?') is registered there, and the
+        # completer tries and these sorted tuples are built from the same dicts.
+        return self._mode_commands_sorted.get(self.mode, ())
+
+    # Sub-commands that may follow 'no', pre-lowered per mode
+    _NO_OPTIONS = {
+        INTERFACE_CONFIG: ('shutdown', 'ip'),
+        GLOBAL_CONFIG: ('hostname', 'interface'),
+    }
+
+    # --- NEW: Helper to find command by abbreviation ---
+    def _find_command_by_abbreviation(self, user_input):
+        """
+        Finds the unique current-mode command that starts with user_input.
+        Returns the full command name if unique.
+        Raises AmbiguousCommandError if multiple matches.
+        Raises InvalidInputError if no match.
+        """
+        user_input_lower = user_input.lower()
+        # Registered command names are lowercase, so a descent of the mode
+        # trie replaces the per-candidate lower()/startswith scan
+        matches = self._mode_tries[self.mode].words_with_prefix(
+            user_input_lower)
+
+        if len(matches) == 1:
+            return matches[0]
+        elif len(matches) > 1:
+            # Check for exact match among ambiguous options
+            if user_input_lower in matches:
+                return user_input_lower
+            raise AmbiguousCommandError(user_input)
+        else:
+            raise InvalidInputError(user_input)  # No command starts with this
+
+    def process_command(self, line):
+        """Parses and executes a command line using abbreviation."""
+        # Split off the first word only; the no-arg majority of commands
+        # never pays for tokenizing a rest-of-line that is empty
+        user_cmd_input, _, rest = line.strip().partition(' ')
+        if not user_cmd_input:
+            return
+        args = rest.split() if rest else []
+
+        # --- Find command handler using abbreviation ---
+        # AmbiguousCommandError/InvalidInputError propagate to the run() loop
+        full_command = self._find_command_by_abbreviation(user_cmd_input)
+
+        # --- Get the handler (one probe of the flat dispatch table) ---
+        handler = self._dispatch.get((self.mode, full_command))
+
+        # --- Execute ---
+        if handler:
+            try:
+                # Pass the *original* arguments list to the handler
+                handler(args)
+            except TypeError as te:
+                # Check arity mismatch using the count cached at registration
+                num_required_params = self._handler_min_args.get(handler, 1)
+                if len(args) < num_required_params:
+                    print(f"% Incomplete command.")
+                else:
+                    # Could be too many args if handler takes none, or other type error
+                    # Let specific handlers raise ValueError for bad args
+                    print(
+                        f"% Invalid input or arguments for command '{full_command}'.")
+                    # print(f"Debug TypeError: {te}") # Uncomment for debug
+            except ValueError as ve:  # Handlers should raise ValueError for bad args
+                print(f"% {ve}")  # Print specific error from handler
+            except IndexError:
+                # Should be less common now, but catch just in case
+                print("% Incomplete command.")
+        else:
+            # This case should be less likely if _get_valid_commands covers all handlers
+            print(
+                f"% Command lookup failed for '{full_command}' (internal error).")
+
+    def print_invalid_input(self, line, command_part):
+        """Prints the standard Cisco 'Invalid input' error."""
+        # Find the offending part case-insensitively; a plain substring
+        # search beats building an escaped regex per invalid command
+        marker_pos = line.lower().find(command_part.lower())
+
+        if marker_pos == -1:
+            # Fallback: position of the first non-space character
+            marker_pos = len(line) - len(line.lstrip())
+
+        print("% Invalid input detected at '^' marker.")
+        print(f"  {line}")
+        print(f"  {' ' * marker_pos}^")
+
+    # --- Command Handlers (do_* methods - updated for arg abbreviation) ---
+
+    def do_help(self, args):
+        # (Implementation largely unchanged)
+        print("Available commands in this context:")
+        # Use the helper to get relevant commands
+        valid_commands = self._get_valid_commands_for_mode()
+        for cmd in valid_commands:
+            print(f"  {cmd}")
+        print("(Use TAB for completion, abbreviations are supported)")
+
+    def do_exit_quit(self, args):
+        if self.mode == USER_EXEC or self.mode == PRIV_EXEC:
+            print("Exiting simulator.")
+            # Return normally and let run() observe the flag; no SystemExit
+            # unwinding through the command machinery
+            self._running = False
+        else:
+            # Should not happen due to command availability check, but good practice
+            raise ValueError("Command not available in this mode.")
+
+    def do_exit_mode(self, args):
+        # (Unchanged)
+        if self.mode == GLOBAL_CONFIG:
+            self.mode = PRIV_EXEC
+        elif self.mode == INTERFACE_CONFIG:
+            self.mode = GLOBAL_CONFIG
+            self.current_interface = None  # Clear current interface when exiting if-mode
+
+    def do_end(self, args):
+        # (Unchanged)
+        if self.mode in [GLOBAL_CONFIG, INTERFACE_CONFIG]:
+            self.mode = PRIV_EXEC
+            self.current_interface = None
+        else:
+            raise ValueError("Command not valid in this mode.")
+
+    def do_enable(self, args):
+        # (Unchanged)
+        self.mode = PRIV_EXEC
+        # Real Cisco might ask for password here if configured
+        # print("% Password: ***** (simulated)") # Keep it simple
+
+    def do_disable(self, args):
+        # (Unchanged)
+        self.mode = USER_EXEC
+
+    def do_configure(self, args):
+        """Enters Global Configuration mode. Expects arg starting with 't'."""
+        # Check for abbreviation 't' for 'terminal'
+        if not args or not args[0].lower().startswith('t'):
+            # Raise ValueError for specific feedback
+            raise ValueError(
+                "Incomplete command. Expecting 'configure terminal'")
+        self.mode = GLOBAL_CONFIG
+        print("Enter configuration commands, one per line. End with CNTL/Z or 'end'.")
+
+    def do_hostname(self, args):
+        """Sets hostname. Expects [new_hostname] in args."""
+        if not args:
+            raise ValueError("Incomplete command. Expecting 'hostname <name>'")
+        new_hostname = args[0]
+        # Basic validation (unchanged)
+        if not self._HOSTNAME_RE.match(new_hostname):
+            raise ValueError("Invalid hostname.")
+        self.running_config['hostname'] = new_hostname
+
+    # First letter of the typed type -> canonical interface type
+    _INTF_TYPE_MAP = {
+        'g': 'GigabitEthernet',
+        'f': 'FastEthernet',
+        'e': 'Ethernet',  # Less common but possible
+    }
+
+    def _normalize_interface_name(self, type_part, num_part):
+        """Standardizes interface names like g -> GigabitEthernet.
+
+        num_part is the \\d+/\\d+ group already captured by the caller's
+        regex, so it needs no re-validation here.
+        """
+        base = self._INTF_TYPE_MAP.get(type_part[:1].lower())
+        if base is None:
+            return None  # Invalid type
+        return f"{base}{num_part}"
+
+    def do_interface(self, args):
+        """Enters interface config mode. Expects [type, number] in args (abbreviations ok)."""
+        if len(args) < 1:  # Need at least the type part
+            raise ValueError(
+                "Incomplete command. Expecting 'interface <type><number>' or 'interface <type> <number>'")
+
+        # Join args in case user typed "g 0/0" vs "g0/0"
+        intf_input = "".join(args)
+
+        # Use regex to separate type abbreviation/name from number
+        # Allows forms like: g0/0, gi0/0, GigabitEthernet0/0, f0/1, fa0/1
+        match = _INTF_ARG_RE.match(intf_input)
+        if not match:
+            raise ValueError(
+                f"Invalid interface format: {intf_input}. Expecting e.g., 'g0/0', 'FastEthernet0/1'")
+
+        intf_type_part = match.group(1)
+        intf_num_part = match.group(2)
+
+        intf_name = self._normalize_interface_name(
+            intf_type_part, intf_num_part)
+
+        if not intf_name:
+            raise ValueError(
+                f"Invalid interface type or number: {intf_type_part} {intf_num_part}")
+
+        # Create interface entry if it doesn't exist
+        if intf_name not in self._interfaces:
+            self._interfaces[intf_name] = Interface()
+            # O(log n) position search + one insert, instead of a full
+            # re-sort on the next 'show'
+            bisect.insort(self._sorted_intf_keys, intf_name,
+                          key=_interface_sort_key)
+            intf_name_lower = intf_name.lower()
+            self._interfaces_lower[intf_name_lower] = intf_name
+            self._interface_trie.insert(intf_name_lower)
+        self.current_interface = intf_name
+        self.mode = INTERFACE_CONFIG
+
+    def do_ip(self, args):
+        """Handles IP commands. Expects arg starting with 'a', then ip, subnet."""
+        if not self.current_interface:
+            raise ValueError(
+                "Command must be run in interface configuration mode.")
+        # Check for 'address' abbreviation
+        if not args or not args[0].lower().startswith('a'):
+            raise ValueError(
+                "Incomplete command. Expecting 'ip address <ip> <subnet>'")
+        if len(args) != 3:
+            raise ValueError(
+                "Incorrect number of arguments. Expecting 'ip address <ip> <subnet>'")
+
+        ip_addr, subnet_mask = args[1], args[2]
+        if not self._is_valid_ip(ip_addr):
+            raise ValueError(f"Invalid IP address format: {ip_addr}")
+        if not self._is_valid_ip(subnet_mask):
+            raise ValueError(f"Invalid subnet mask format: {subnet_mask}")
+
+        intf_data = self._interfaces[self.current_interface]
+        intf_data.ip_address = ip_addr
+        intf_data.subnet_mask = subnet_mask
+        _recompute_status(intf_data)
+
+    @staticmethod
+    def _is_valid_ip(ip_str):
+        # Validate in C via inet_aton; the dot-count guard rejects the
+        # short forms ('1', '1.2', '1.2.3') that inet_aton also accepts
+        try:
+            socket.inet_aton(ip_str)
+        except OSError:
+            return False
+        return ip_str.count('.') == 3
+
+    def do_shutdown(self, args):
+        """Administratively disables the current interface. Expects empty args."""
+        if not self.current_interface:
+            raise ValueError(
+                "Command must be run in interface configuration mode.")
+        if args:
+            raise ValueError("Command 'shutdown' takes no arguments.")
+
+        intf_data = self._interfaces[self.current_interface]
+        intf_data.admin_status = 'down'
+        _recompute_status(intf_data)
+
+    def do_no(self, args):
+        """Handles 'no' commands. Expects [sub_command, ...] in args (abbreviations ok)."""
+        if not args:
+            raise ValueError("Incomplete 'no' command.")
+
+        # Find the sub-command using abbreviation relative to the current mode's 'no' options
+        no_sub_command_input = args[0]
+        sub_args = args[1:]
+
+        # Find the specific 'no' sub-command (e.g., 'shutdown' or 'ip');
+        # the input is lowered once and matched via the shared helper
+        try:
+            matched_sub_command = _resolve_abbrev(
+                no_sub_command_input.lower(), self._NO_OPTIONS.get(self.mode, ()))
+        except AmbiguousCommandError:
+            raise AmbiguousCommandError(f"no {no_sub_command_input}")
+        if not matched_sub_command:
+            # Unrecognized 'no' variant
+            raise InvalidInputError(f"no {no_sub_command_input}")
+
+        # --- Execute the specific 'no' action (one table probe) ---
+        handler = self._no_handlers.get((self.mode, matched_sub_command))
+        if handler is None:
+            # Should not be reachable if mode checks work
+            raise ValueError("'no' command not applicable in this mode.")
+        handler(sub_args)
+
+    def _no_ip(self, args):
+        """Handles 'no ip ...'; only 'address' is supported."""
+        # Further check for 'address' abbreviation
+        if not args or not args[0].lower().startswith('a'):
+            raise ValueError("Incomplete command. Expecting 'no ip address'")
+        # Pass args after 'address' (should be none)
+        self._no_ip_address(args[1:])
+
+    def _no_hostname(self, args):
+        raise ValueError("Cannot 'no hostname'. Set a new one instead.")
+
+    def _no_interface(self, args):
+        raise ValueError(
+            "Use 'default interface <name>' to reset an interface (not implemented).")
+
+    def _no_shutdown(self, args):
+        """Handles 'no shutdown'."""
+        if not self.current_interface:
+            return  # Should be caught earlier
+        if args:
+            raise ValueError("'no shutdown' takes no arguments.")
+
+        intf_data = self._interfaces[self.current_interface]
+        # Simple simulation: comes up only if an IP exists, otherwise the
+        # protocol stays down
+        intf_data.admin_status = 'up'
+        _recompute_status(intf_data)
+
+    def _no_ip_address(self, args):
+        """Handles 'no ip address'."""
+        if not self.current_interface:
+            return  # Should be caught earlier
+        if args:
+            raise ValueError("'no ip address' takes no further arguments.")
+
+        intf_data = self._interfaces[self.current_interface]
+        intf_data.ip_address = None
+        intf_data.subnet_mask = None
+        _recompute_status(intf_data)
+
+    # --- Show Commands ---
+
+    @staticmethod
+    def _resolve_show_option(table, word, context):
+        """Look up one 'show' argument in a prefix-dispatch table.
+
+        Returns the bound handler for the (possibly abbreviated) word.
+        Raises AmbiguousCommandError/InvalidInputError with the full
+        command context in the message, matching the old resolution.
+        """
+        handler = table.get(word.lower())
+        if handler is None:
+            raise InvalidInputError(f"{context} {word}")
+        if handler is _AMBIGUOUS:
+            raise AmbiguousCommandError(f"{context} {word}")
+        return handler
+
+    def do_show(self, args):
+        """Handles 'show' commands. Expects [sub_command, ...] in args (abbreviations ok)."""
+        if not args:
+            raise ValueError(
+                "Incomplete command. Expecting 'show <subcommand>'")
+        handler = self._resolve_show_option(self._show_dispatch, args[0],
+                                            "show")
+        handler(args[1:])
+
+    def _do_show_ip(self, args):
+        """Handles 'show ip ...'; the show dispatch table binds here."""
+        if not args:
+            raise ValueError(
+                "Incomplete command. Expecting 'show ip <subcommand>'")
+        handler = self._resolve_show_option(self._show_ip_dispatch, args[0],
+                                            "show ip")
+        handler(args[1:])
+
+    def _do_show_ip_interface(self, args):
+        """Handles 'show ip interface ...'."""
+        if not args:
+            raise ValueError(
+                "Incomplete command. Expecting 'show ip interface <subcommand>' or 'brief'")
+        handler = self._resolve_show_option(self._show_ip_int_dispatch,
+                                            args[0], "show ip interface")
+        handler(args[1:])
+
+    # --- show_version, show_running_config, show_ip_interface_brief, show_history methods ---
+    # (Largely unchanged, but ensure they handle potential extra args gracefully if needed)
+
+    def show_version(self, args):
+        if args:
+            print(f"% Invalid input detected near '{args[0]}'")  # Basic check
+        # Uptime from the monotonic mark set at init; the old code formatted
+        # the wall-clock time of day, which wasn't an uptime at all and also
+        # paid for strftime/gmtime on every call
+        minutes, seconds = divmod(int(time.monotonic() - self._start_time), 60)
+        hours, minutes = divmod(minutes, 60)
+        sys.stdout.write(_VERSION_FMT(self.running_config['hostname'],
+                                      hours, minutes, seconds))
+
+    def show_running_config(self, args):
+        if args:
+            print(f"% Invalid input detected near '{args[0]}'")
+        # Build the whole config in memory and emit it in one write;
+        # print-per-line locks and flushes line-buffered stdout each time
+        lines = [_RUN_HEADER_FMT(self.running_config['hostname'])]
+        append = lines.append
+        interfaces = self._interfaces
+        # Names are already in display order; sorted incrementally at insert
+        for intf_name in self._sorted_intf_keys:
+            intf_data = interfaces[intf_name]
+            append("interface " + intf_name)
+            if intf_data.ip_address:
+                append(_RUN_IP_FMT(intf_data.ip_address,
+                                   intf_data.subnet_mask))
+            # Only show shutdown if it's administratively down
+            if intf_data.admin_status == 'down':
+                append(" shutdown")
+            append("!")
+        append("!")
+        lines.append("end")
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    def show_ip_interface_brief(self, args):
+        if args:
+            print(f"% Invalid input detected near '{args[0]}'")
+        # Same batching as show_running_config: one write for the table
+        lines = [
+            "Interface                  IP-Address      OK? Method Status                Protocol"]
+        sorted_interfaces = self._sorted_intf_keys
+        if not sorted_interfaces:
+            lines.append("% No interfaces configured for IP.")  # Message if empty
+            sys.stdout.write('\n'.join(lines) + '\n')
+            return
+        interfaces = self._interfaces
+        append = lines.append
+        for intf_name in sorted_interfaces:
+            ip_address, admin_status, status = _BRIEF_FIELDS(
+                interfaces[intf_name])
+            has_ip = ip_address is not None
+            ip_addr = ip_address if has_ip else 'unassigned'
+            # OK? is YES if IP is assigned AND interface is admin up
+            ok = "YES" if has_ip and admin_status == 'up' else "NO"
+            method = "manual" if has_ip else "unset"
+            # Protocol is 'up' only if status is 'up' (simple simulation)
+            protocol = 'up' if status == 'up' else 'down'
+            append(_BRIEF_FMT(intf_name, ip_addr, ok, method, status,
+                              protocol))
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    def show_history(self, args=None):  # Accept args but ignore them
+        if args:
+            print(f"% Invalid input detected near '{args[0]}'")
+        # Use readline's history if available for more realistic behavior.
+        # Either path builds the listing in memory and emits one write,
+        # like the other show commands.
+        if READLINE_AVAILABLE:
+            history_len = readline.get_current_history_length()
+            if history_len <= 0:
+                print("Command history is empty.")
+                return
+            # Readline history is 1-based index
+            lines = ["Command History (from readline):"]
+            lines.extend(f" {i}: {readline.get_history_item(i)}"
+                         for i in range(1, history_len + 1))
+        else:
+            # Fallback to internal list
+            if not self.command_history:
+                print("Command history is empty.")
+                return
+            lines = ["Command History (internal):"]
+            lines.extend(f" {i}: {cmd}"
+                         for i, cmd in enumerate(self.command_history, 1))
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    simulator = CiscoDeviceSimulator()
+    simulator.run()